@@ -3,11 +3,28 @@
 # Zabbix SIA licenses this file to you under the MIT License.
 # See the LICENSE file in the project root for more information.
 
-import sys
-import json
 import asyncio
 from zabbix_utils import AsyncGetter
 
+# Use orjson to parse JSON responses faster if it's installed
+try:
+    from orjson import loads, JSONDecodeError
+except ModuleNotFoundError:
+    from json import loads, JSONDecodeError
+
+
+# Zabbix agent item keys to query concurrently
+KEYS = [
+    'net.if.discovery',
+    'system.uname',
+    'system.hostname',
+    'system.cpu.load',
+    'agent.version'
+]
+
+# Maximum number of simultaneously opened connections to Zabbix agent
+MAX_CONNECTIONS = 64
+
 
 async def main():
     """
@@ -17,27 +34,43 @@ async def main():
     # Create a AsyncGetter instance for querying Zabbix agent
     agent = AsyncGetter(host='127.0.0.1', port=10050)
 
-    # Send a Zabbix agent query for network interface discovery
-    resp = await agent.get('net.if.discovery')
-
-    # Check if there was an error in the response
-    if resp.error:
-        # Print the error message
-        print("An error occurred while trying to get the value:", resp.error)
-        # Exit the script
-        sys.exit()
-
-    try:
-        # Attempt to parse the JSON response
-        resp_list = json.loads(resp.value)
-    except json.decoder.JSONDecodeError:
-        print("Agent response decoding fails")
-        # Exit the script if JSON decoding fails
-        sys.exit()
-
-    # Iterate through the discovered network interfaces and print their names
-    for interface in resp_list:
-        print(interface['{#IFNAME}'])
+    # Limit the number of simultaneously opened connections
+    semaphore = asyncio.Semaphore(MAX_CONNECTIONS)
+
+    async def get_value(key):
+        async with semaphore:
+            return await agent.get(key)
+
+    # Send all Zabbix agent queries concurrently
+    responses = await asyncio.gather(*(get_value(key) for key in KEYS), return_exceptions=True)
+
+    for key, resp in zip(KEYS, responses):
+        # Check if the connection to Zabbix agent failed
+        if isinstance(resp, Exception):
+            print(f"An error occurred while trying to get '{key}':", resp)
+            continue
+
+        # Check if there was an error in the response
+        if resp.error:
+            # Print the error message
+            print(f"An error occurred while trying to get '{key}':", resp.error)
+            continue
+
+        if key != 'net.if.discovery':
+            # Print the value obtained for the specified item key
+            print(f"Received value of '{key}':", resp.value)
+            continue
+
+        try:
+            # Attempt to parse the JSON response
+            resp_list = loads(resp.value)
+        except JSONDecodeError:
+            print("Agent response decoding fails")
+            continue
+
+        # Iterate through the discovered network interfaces and print their names
+        for interface in resp_list:
+            print(interface['{#IFNAME}'])
 
 # Run the main coroutine
 asyncio.run(main())
@@ -1,8 +1,7 @@
-import json
 import os
 from datetime import datetime
 
-from zabbix_utils import Sender
+from zabbix_utils import ItemValue, Sender
 
 # Zabbix server/proxy details for Sender
 ZABBIX_SERVER = {
@@ -16,23 +15,30 @@ sender = Sender(**ZABBIX_SERVER)
 data_dir = "./examples/sender/synchronous/data"
 file_list = sorted(os.listdir(data_dir))
 
+# Collect the values of all files to send them in a single batch
+items = []
+
 for file_name in file_list:
     file_path = os.path.join(data_dir, file_name)
     date_str = file_name.split("/")[-1].split(".")[0]
     date_obj = datetime.strptime(date_str, "%Y-%m-%d")
     start_date_seconds = int(date_obj.timestamp())
 
-    with open(file_path, "r") as metric:
-        try:
-            response = sender.send_value(
-                "API - Gugelmin", "gugelmin_metrics", json.dumps(metric.read()), start_date_seconds, 0
-            )
-
-            if response.failed == 0:
-                print(f"Value sent successfully in {response.time}")
-            else:
-                print("Failed to send value")
-        except Exception as e:
-            print(f"Failed to send metrics for date {date_str}: {e}")
+    # The file content is already JSON, so it's sent as is without re-encoding
+    with open(file_path, "r", encoding="utf-8") as metric:
+        items.append(
+            ItemValue("API - Gugelmin", "gugelmin_metrics", metric.read(), start_date_seconds, 0)
+        )
+
+# Send all collected values at once. Sender splits them into chunks of chunk_size items.
+try:
+    response = sender.send(items)
+
+    if response.failed == 0:
+        print(f"Values sent successfully in {response.time}")
+    else:
+        print(f"Failed to send {response.failed} of {response.total} values")
+except Exception as e:
+    print(f"Failed to send metrics: {e}")
 
 # zabbix_sender -z zabbix.in.neoncorp.com.br -s "API - Gugelmin" -k gugelmin_metrics -o 43
@@ -48,6 +48,7 @@ setuptools.setup(
     install_requires=[],
     extras_require={
         "async": ["aiohttp>=3,<4"],
+        "orjson": ["orjson>=3,<4"],
     },
     python_requires='>=3.8',
     project_urls={
@@ -140,6 +140,10 @@ class MockConnector():
         resp = self.STREAM[0:bufsize]
         self.STREAM = self.STREAM[bufsize:]
         return resp
+    def recv_into(self, buffer, nbytes=0, *args, **kwargs):
+        resp = self.recv(nbytes or len(buffer), *args, **kwargs)
+        buffer[:len(resp)] = resp
+        return len(resp)
     def sendall(self, *args, **kwargs):
         self.__raiser(*args, **kwargs)
 
@@ -187,6 +191,8 @@ class MockWriter():
 class MockLogger():
     def debug(self, *args, **kwargs):
         pass
+    def isEnabledFor(self, *args, **kwargs):
+        return True
     def error(self, *args, **kwargs):
         pass
     def warning(self, *args, **kwargs):
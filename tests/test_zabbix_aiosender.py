@@ -127,6 +127,11 @@ class TestAsyncSender(unittest.IsolatedAsyncioTestCase):
                                msg="expected TypeError exception hasn't been raised"):
             sender = AsyncSender(server='localhost', port='test')
 
+        for level in [-2, 10]:
+            with self.assertRaises(ValueError,
+                                   msg="expected ValueError exception hasn't been raised"):
+                sender = AsyncSender(compression=True, compression_level=level)
+
     async def test_get_response(self):
         """Tests __get_response method in different cases"""
 
@@ -290,6 +295,12 @@ class TestAsyncSender(unittest.IsolatedAsyncioTestCase):
                 'output': output,
                 'raised': False
             },
+            {
+                'connection': {'input_stream': response},
+                'input': {'compression': True, 'compression_level': 1},
+                'output': output,
+                'raised': False
+            },
             {
                 'connection': {'input_stream': response, 'exception': TypeError},
                 'input': {'ssl_context': lambda x: ''},
@@ -340,6 +351,22 @@ class TestAsyncSender(unittest.IsolatedAsyncioTestCase):
                     self.assertEqual(repr(resp), repr(TrapperResponse(1).add(case['output'])),
                                     f"unexpected output with input data: {case['input']}")
 
+        async def mock_open_connection2(*args, **kwargs):
+            reader = common.MockReader()
+            reader.set_stream(response)
+            writer = common.MockWriter()
+            return reader, writer
+
+        with unittest.mock.patch.multiple(
+                asyncio,
+                open_connection=mock_open_connection2), \
+                patch.object(ZabbixProtocol, 'create_packet',
+                             wraps=ZabbixProtocol.create_packet) as mock_create_packet:
+            sender = AsyncSender(compression=True, compression_level=1)
+            await sender.send_value(**request)
+            self.assertEqual(mock_create_packet.call_args.args[2:], (True, 1),
+                             "compression_level wasn't passed to create_packet")
+
         for exc in [asyncio.TimeoutError, socket.gaierror]:
 
             async def mock_open_connection1(*args, **kwargs):
@@ -364,6 +391,62 @@ class TestAsyncSender(unittest.IsolatedAsyncioTestCase):
                                        msg="expected ProcessingError exception hasn't been raised"):
                     resp = await sender.send_value(**request)
 
+    async def test_send_clusters(self):
+        """Tests send_value method with failure of one of clusters"""
+
+        request = {"host": "test_host", "key": "test_key", "value": "true", "clock": 1695713666, "ns": 100}
+        output = common.response_gen([request])
+        response = ZabbixProtocol.create_packet(output, common.MockLogger())
+
+        events = []
+
+        class MockWriter():
+            def __init__(self, node):
+                self.node = node
+            def write(self, *args, **kwargs):
+                events.append(('write', self.node))
+            async def drain(self, *args, **kwargs):
+                await asyncio.sleep(0)
+            def close(self):
+                events.append(('close', self.node))
+            async def wait_closed(self):
+                pass
+
+        async def mock_open_connection(host, *args, **kwargs):
+            if host.startswith('failed'):
+                raise ConnectionRefusedError()
+            # Let the failed cluster finish first
+            for _ in range(5):
+                await asyncio.sleep(0)
+            reader = common.MockReader()
+            reader.set_stream(response)
+            return reader, MockWriter(host)
+
+        with unittest.mock.patch.multiple(
+                asyncio,
+                open_connection=mock_open_connection):
+
+            sender = AsyncSender(clusters=[['failed1.node'], ['working.node'], ['failed2.node']])
+
+            with self.assertLogs('zabbix_utils.aiosender', level='ERROR') as logs, \
+                    self.assertRaises(ProcessingError,
+                                      msg="expected ProcessingError exception hasn't been raised"):
+                await sender.send_value(**request)
+
+            events_count = len(events)
+            for _ in range(10):
+                await asyncio.sleep(0)
+
+        self.assertEqual(len(events), events_count,
+                         "unexpected sending to clusters after the error was raised")
+        self.assertEqual(events, [('write', 'working.node'), ('close', 'working.node')],
+                         "unexpected sending to clusters")
+        for node in ['failed1.node', 'failed2.node']:
+            self.assertTrue(
+                any(node in msg and 'trying to send to cluster' in msg for msg in logs.output),
+                f"error of the cluster {node} wasn't logged")
+
+    @patch('zabbix_utils.common.orjson', None)
     def test_create_request(self):
         """Tests create_packet method in different cases"""
 
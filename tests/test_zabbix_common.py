@@ -22,9 +22,13 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
 # OTHER DEALINGS IN THE SOFTWARE.
 
+import json
+import zlib
 import unittest
+from unittest.mock import patch
 
-from zabbix_utils.common import ModuleUtils, ZabbixProtocol
+from tests import common
+from zabbix_utils.common import ModuleUtils, ZabbixProtocol, orjson
 
 
 class TestModuleUtils(unittest.TestCase):
@@ -40,7 +44,9 @@ class TestModuleUtils(unittest.TestCase):
             {'input': 'https://localhost', 'output': f"https://localhost/{filename}"},
             {'input': 'localhost/zabbix', 'output': f"http://localhost/zabbix/{filename}"},
             {'input': 'localhost/', 'output': f"http://localhost/{filename}"},
-            {'input': f"127.0.0.1/{filename}", 'output': f"http://127.0.0.1/{filename}"}
+            {'input': f"127.0.0.1/{filename}", 'output': f"http://127.0.0.1/{filename}"},
+            {'input': 'https://localhost:8443/zabbix/', 'output': f"https://localhost:8443/zabbix/{filename}"},
+            {'input': 'httpd.local', 'output': f"http://httpd.local/{filename}"}
         ]
 
         for case in test_cases:
@@ -67,6 +73,24 @@ class TestModuleUtils(unittest.TestCase):
             self.assertEqual(result, case['output'],
                              f"unexpected output with input data: {case['input']}")
 
+    def test_json_encode(self):
+        """Tests json_encode method in different cases"""
+
+        test_cases = [
+            {'input': {"jsonrpc": "2.0", "method": "host.get", "params": {}, "id": 1}},
+            {'input': [{"host": "glāžšķūņu rūķīši", "value": "0"}, {"clock": 1695713666}]}
+        ]
+
+        for case in test_cases:
+            with patch('zabbix_utils.common.orjson', None):
+                result = ModuleUtils.json_encode(case['input'])
+            self.assertEqual(result, json.dumps(case['input'], ensure_ascii=False).encode("utf-8"),
+                             f"unexpected output with input data: {case['input']}")
+
+            result = ModuleUtils.json_encode(case['input'])
+            self.assertEqual(json.loads(result), case['input'],
+                             f"unexpected output with input data: {case['input']}")
+
     def test_hide_private(self):
         """Tests hide_private method in different cases"""
 
@@ -136,6 +160,14 @@ class TestModuleUtils(unittest.TestCase):
             {
                 'input': [{"result": ["jZAC51wHuWdwvQnxwbP2T55vh6R5R2uW"]}, {}],
                 'output': {"result": [f"jZAC51wHuWdwvQnxwbP2T55vh6R5R2uW"]}
+            },
+            {
+                'input': [{1: [{"token": "jZAC51wHuWdwvQnxwbP2T55vh6R5R2uW"}, 10]}],
+                'output': {1: [{"token": f"jZAC{mask}R2uW"}, 10]}
+            },
+            {
+                'input': [{"secret": "HlphkcKgQKvofQHP", "token": "jZAC51wHuWdwvQnx"}, {"secret": r"^.+$"}],
+                'output': {"secret": mask, "token": "jZAC51wHuWdwvQnx"}
             }
         ]
 
@@ -154,6 +186,8 @@ class TestZabbixProtocol(unittest.TestCase):
         class Logger():
             def debug(self, *args, **kwargs):
                 pass
+            def isEnabledFor(self, *args, **kwargs):
+                return True
 
         test_cases = [
             {
@@ -171,6 +205,11 @@ class TestZabbixProtocol(unittest.TestCase):
             {
                 'input': {'payload':'glāžšķūņu rūķīši', 'log':Logger()},
                 'output': b'ZBXD\x01\x1a\x00\x00\x00\x00\x00\x00\x00gl\xc4\x81\xc5\xbe\xc5\xa1\xc4\xb7\xc5\xab\xc5\x86u r\xc5\xab\xc4\xb7\xc4\xab\xc5\xa1i'
+            },
+            {
+                'input': {'payload':'test_compression_level', 'log':Logger(),
+                          'compression':True, 'compression_level':1},
+                'output': b'ZBXD\x03\x1e\x00\x00\x00\x16\x00\x00\x00x\x01+I-.\x89O\xce\xcf-(J-.\xce\xcc\xcf\x8b\xcfI-K\xcd\x01\x00kE\tI'
             }
         ]
 
@@ -179,6 +218,65 @@ class TestZabbixProtocol(unittest.TestCase):
             self.assertEqual(resp, case['output'],
                              f"unexpected output with input data: {case['input']}")
 
+    def test_create_packet_json(self):
+        """Tests create_packet method with JSON-serializable payload"""
+
+        class Logger():
+            def debug(self, *args, **kwargs):
+                pass
+            def isEnabledFor(self, *args, **kwargs):
+                return True
+
+        payload = {"request": "sender data", "data": [{"host": "test", "key": "glāžšķūņu rūķīši", "value": "0"}]}
+
+        with patch('zabbix_utils.common.orjson', None):
+            resp = ZabbixProtocol.create_packet(payload, Logger())
+        self.assertEqual(resp[ZabbixProtocol.HEADER_SIZE:],
+                         json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+                         f"unexpected output with input data: {payload}")
+
+    @unittest.skipIf(orjson is None, "orjson is not installed")
+    def test_create_packet_orjson(self):
+        """Tests create_packet method with JSON-serializable payload encoded by orjson"""
+
+        class Logger():
+            def debug(self, *args, **kwargs):
+                pass
+            def isEnabledFor(self, *args, **kwargs):
+                return True
+
+        payload = {"request": "sender data", "data": [{"host": "test", "key": "glāžšķūņu rūķīši", "value": "0"}]}
+
+        resp = ZabbixProtocol.create_packet(payload, Logger())
+        self.assertEqual(resp[ZabbixProtocol.HEADER_SIZE:],
+                         orjson.dumps(payload),
+                         f"unexpected output with input data: {payload}")
+        self.assertEqual(json.loads(resp[ZabbixProtocol.HEADER_SIZE:]), payload,
+                         f"unexpected output with input data: {payload}")
+
+    def test_receive_compressed_packet(self):
+        """Tests receive_compressed_packet method in different cases"""
+
+        payload = json.dumps([{"host": "test", "key": f"key{i}", "value": i} for i in range(100)])
+        compressed = zlib.compress(payload.encode("utf-8"))
+
+        for chunk_size in [16, 256, 16384]:
+            conn = common.MockConnector(compressed)
+            resp = ZabbixProtocol.receive_compressed_packet(
+                conn, len(compressed), common.MockLogger(), chunk_size)
+            self.assertEqual(resp.decode("utf-8"), payload,
+                             f"unexpected output with chunk size: {chunk_size}")
+
+        with self.assertRaises(zlib.error,
+                               msg="expected zlib.error exception hasn't been raised"):
+            conn = common.MockConnector(compressed[:-10])
+            ZabbixProtocol.receive_compressed_packet(conn, len(compressed), common.MockLogger())
+
+        with self.assertRaises(zlib.error,
+                               msg="expected zlib.error exception hasn't been raised"):
+            conn = common.MockConnector(b'test' * 10)
+            ZabbixProtocol.receive_compressed_packet(conn, 40, common.MockLogger())
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
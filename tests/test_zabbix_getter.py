@@ -168,6 +168,7 @@ class TestGetter(unittest.TestCase):
             with unittest.mock.patch('socket.socket') as mock_socket:
                 test_connector = common.MockConnector(**case['connection'])
                 mock_socket.return_value.recv = test_connector.recv
+                mock_socket.return_value.recv_into = test_connector.recv_into
                 mock_socket.return_value.sendall = test_connector.sendall
                 getter = Getter(**case['input'])
                 
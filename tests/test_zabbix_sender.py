@@ -126,6 +126,11 @@ class TestSender(unittest.TestCase):
                                msg="expected TypeError exception hasn't been raised"):
             sender = Sender(server='localhost', port='test')
 
+        for level in [-2, 10]:
+            with self.assertRaises(ValueError,
+                                   msg="expected ValueError exception hasn't been raised"):
+                sender = Sender(compression=True, compression_level=level)
+
     def test_get_response(self):
         """Tests __get_response method in different cases"""
 
@@ -297,6 +302,12 @@ class TestSender(unittest.TestCase):
                 'output': output,
                 'raised': False
             },
+            {
+                'connection': {'input_stream': response},
+                'input': {'compression': True, 'compression_level': 1},
+                'output': output,
+                'raised': False
+            },
             {
                 'connection': {'input_stream': response, 'exception': socket.error},
                 'input': {},
@@ -327,6 +338,7 @@ class TestSender(unittest.TestCase):
             with unittest.mock.patch('socket.socket') as mock_socket:
                 test_connector = common.MockConnector(**case['connection'])
                 mock_socket.return_value.recv = test_connector.recv
+                mock_socket.return_value.recv_into = test_connector.recv_into
                 mock_socket.return_value.sendall = test_connector.sendall
                 sender = Sender(**case['input'])
 
@@ -339,10 +351,23 @@ class TestSender(unittest.TestCase):
                     self.assertEqual(repr(resp), repr(TrapperResponse(1).add(case['output'])),
                                     f"unexpected output with input data: {case['input']}")
 
+        with unittest.mock.patch('socket.socket') as mock_socket, \
+                patch.object(ZabbixProtocol, 'create_packet',
+                             wraps=ZabbixProtocol.create_packet) as mock_create_packet:
+            test_connector = common.MockConnector(response)
+            mock_socket.return_value.recv = test_connector.recv
+            mock_socket.return_value.recv_into = test_connector.recv_into
+            mock_socket.return_value.sendall = test_connector.sendall
+            sender = Sender(compression=True, compression_level=1)
+            sender.send_value(**request)
+            self.assertEqual(mock_create_packet.call_args.args[2:], (True, 1),
+                             "compression_level wasn't passed to create_packet")
+
         for exc in [socket.timeout, socket.gaierror]:
             with unittest.mock.patch('socket.socket') as mock_socket:
                 test_connector = common.MockConnector(response, exception=exc)
                 mock_socket.return_value.recv = test_connector.recv
+                mock_socket.return_value.recv_into = test_connector.recv_into
                 mock_socket.return_value.sendall = test_connector.sendall
                 mock_socket.return_value.connect = test_connector.connect
                 sender = Sender(**case['input'])
@@ -351,6 +376,7 @@ class TestSender(unittest.TestCase):
                                 msg="expected ProcessingError exception hasn't been raised"):
                     resp = sender.send_value(**request)
 
+    @patch('zabbix_utils.common.orjson', None)
     def test_create_request(self):
         """Tests create_packet method in different cases"""
 
@@ -324,7 +324,8 @@ class AsyncZabbixAPI():
                 "Received response body: %s",
                 response
             )
-        else:
+        elif log.isEnabledFor(logging.DEBUG):
+            # Clipping of exported files is done only if it's going to be logged
             debug_json = response.copy()
             if debug_json.get('result'):
                 debug_json['result'] = shorten(debug_json['result'], 200, placeholder='...')
@@ -364,7 +365,7 @@ class AsyncZabbixAPI():
 
         resp = await self.client_session.post(
             self.url,
-            json=request_json,
+            data=ModuleUtils.json_encode(request_json),
             headers=headers,
             timeout=self.timeout
         )
@@ -409,7 +410,7 @@ class AsyncZabbixAPI():
 
         req = ul.Request(
             self.url,
-            data=json.dumps(request_json).encode("utf-8"),
+            data=ModuleUtils.json_encode(request_json),
             headers=headers,
             method='POST'
         )
@@ -425,7 +426,7 @@ class AsyncZabbixAPI():
 
         try:
             resp = ul.urlopen(req, context=ctx)
-            resp_json = json.loads(resp.read().decode('utf-8'))
+            resp_json = json.loads(resp.read())
         except URLError as err:
             raise ProcessingError(f"Unable to connect to {self.url}:", err) from None
         except ValueError as err:
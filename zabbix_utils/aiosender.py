@@ -24,17 +24,18 @@
 
 import ssl
 import json
+import zlib
 import socket
 import asyncio
 import logging
 import configparser
 
-from typing import Callable, Union, Optional
+from typing import Callable, Union, Optional, Tuple
 
 from .logger import EmptyHandler
 from .common import ZabbixProtocol
 from .exceptions import ProcessingError
-from .types import TrapperResponse, ItemValue, Cluster
+from .types import TrapperResponse, ItemValue, Cluster, Node
 
 log = logging.getLogger(__name__)
 log.addHandler(EmptyHandler())
@@ -43,6 +44,11 @@ log.addHandler(EmptyHandler())
 class AsyncSender():
     """Zabbix sender asynchronous implementation.
 
+    Each chunk is sent to all clusters concurrently. If sending to a cluster fails,
+    the chunk is still delivered to the other clusters, and the first error is raised
+    only after all of them have finished. Unlike the synchronous Sender, retrying after
+    such an error sends the values again to the clusters that already received them.
+
     Args:
         server (str, optional): Zabbix server address. Defaults to `'127.0.0.1'`.
         port (int, optional): Zabbix server port. Defaults to `10051`.
@@ -57,6 +63,9 @@ Defaults to `None`.
         compression (bool, optional): Specifying compression use. Defaults to `False`.
         config_path (str, optional): Path to Zabbix agent configuration file. Defaults to \
 `/etc/zabbix/zabbix_agentd.conf`.
+        compression_level (int, optional): Zlib compression level from `0` to `9` or `-1` \
+for the zlib default level. Used only if compression is enabled. \
+Defaults to `zlib.Z_DEFAULT_COMPRESSION` (`-1`).
     """
 
     def __init__(self, server: Optional[str] = None, port: int = 10051,
@@ -64,7 +73,8 @@ Defaults to `None`.
                  use_ipv6: bool = False, source_ip: Optional[str] = None,
                  chunk_size: int = 250, clusters: Union[tuple, list] = None,
                  ssl_context: Optional[Callable] = None, compression: bool = False,
-                 config_path: Optional[str] = '/etc/zabbix/zabbix_agentd.conf'):
+                 config_path: Optional[str] = '/etc/zabbix/zabbix_agentd.conf',
+                 compression_level: int = zlib.Z_DEFAULT_COMPRESSION):
         self.timeout = timeout
         self.use_ipv6 = use_ipv6
         self.tls = {}
@@ -73,6 +83,10 @@ Defaults to `None`.
         self.chunk_size = chunk_size
         self.compression = compression
 
+        if compression_level not in range(-1, 10):
+            raise ValueError('Value "compression_level" should be from -1 to 9.') from None
+        self.compression_level = compression_level
+
         if ssl_context is not None:
             if not isinstance(ssl_context, Callable):
                 raise TypeError('Value "ssl_context" should be a function.') from None
@@ -122,7 +136,7 @@ Defaults to `None`.
     async def __get_response(self, reader: asyncio.StreamReader) -> Optional[str]:
         try:
             result = json.loads(
-                await ZabbixProtocol.parse_async_packet(reader, log, ProcessingError)
+                await ZabbixProtocol.parse_async_packet(reader, log, ProcessingError, decode=False)
             )
         except json.decoder.JSONDecodeError as err:
             log.debug('Unexpected response was received from Zabbix.')
@@ -138,63 +152,59 @@ Defaults to `None`.
             "data": [i.to_json() for i in items]
         }
 
-    async def __chunk_send(self, items: list) -> dict:
-        responses = {}
-
-        packet = ZabbixProtocol.create_packet(self.__create_request(items), log, self.compression)
-
-        for cluster in self.clusters:
-            active_node = None
+    async def __cluster_send(self, cluster: Cluster, packet: bytearray) -> Tuple[Node, dict]:
+        active_node = None
 
-            for i, node in enumerate(cluster.nodes):
+        for i, node in enumerate(cluster.nodes):
 
-                log.debug('Trying to send data to %s', node)
+            log.debug('Trying to send data to %s', node)
 
-                connection_params = {
-                    "host": node.address,
-                    "port": node.port
-                }
+            connection_params = {
+                "host": node.address,
+                "port": node.port
+            }
 
-                if self.source_ip:
-                    connection_params['local_addr'] = (self.source_ip, 0)
+            if self.source_ip:
+                connection_params['local_addr'] = (self.source_ip, 0)
 
-                if self.ssl_context is not None:
-                    connection_params['ssl'] = self.ssl_context(self.tls)
-                    if not isinstance(connection_params['ssl'], ssl.SSLContext):
-                        raise TypeError(
-                            'Function "ssl_context" must return "ssl.SSLContext".') from None
+            if self.ssl_context is not None:
+                connection_params['ssl'] = self.ssl_context(self.tls)
+                if not isinstance(connection_params['ssl'], ssl.SSLContext):
+                    raise TypeError(
+                        'Function "ssl_context" must return "ssl.SSLContext".') from None
 
-                connection = asyncio.open_connection(**connection_params)
+            connection = asyncio.open_connection(**connection_params)
 
-                try:
-                    reader, writer = await asyncio.wait_for(connection, timeout=self.timeout)
-                except asyncio.TimeoutError:
-                    log.debug(
-                        'The connection to %s timed out after %d seconds',
-                        node,
-                        self.timeout
-                    )
-                except (ConnectionRefusedError, socket.gaierror) as err:
-                    log.debug(
-                        'An error occurred while trying to connect to %s: %s',
-                        node,
-                        getattr(err, 'msg', str(err))
-                    )
-                else:
-                    if i > 0:
-                        cluster.nodes[0], cluster.nodes[i] = cluster.nodes[i], cluster.nodes[0]
-                    active_node = node
-                    break
-
-            if active_node is None:
-                log.error(
-                    'Couldn\'t connect to all of cluster nodes: %s',
-                    str(list(cluster.nodes))
+            try:
+                reader, writer = await asyncio.wait_for(connection, timeout=self.timeout)
+            except asyncio.TimeoutError:
+                log.debug(
+                    'The connection to %s timed out after %d seconds',
+                    node,
+                    self.timeout
                 )
-                raise ProcessingError(
-                    f"Couldn't connect to all of cluster nodes: {list(cluster.nodes)}"
+            except (ConnectionRefusedError, socket.gaierror) as err:
+                log.debug(
+                    'An error occurred while trying to connect to %s: %s',
+                    node,
+                    getattr(err, 'msg', str(err))
                 )
+            else:
+                if i > 0:
+                    cluster.nodes[0], cluster.nodes[i] = cluster.nodes[i], cluster.nodes[0]
+                active_node = node
+                break
+
+        if active_node is None:
+            log.error(
+                'Couldn\'t connect to all of cluster nodes: %s',
+                str(list(cluster.nodes))
+            )
+            raise ProcessingError(
+                f"Couldn't connect to all of cluster nodes: {list(cluster.nodes)}"
+            )
 
+        try:
             try:
                 writer.write(packet)
                 send_data = writer.drain()
@@ -205,8 +215,6 @@ Defaults to `None`.
                     active_node,
                     self.timeout
                 )
-                writer.close()
-                await writer.wait_closed()
                 raise err
             except (OSError, socket.error) as err:
                 log.warning(
@@ -214,8 +222,6 @@ Defaults to `None`.
                     active_node,
                     getattr(err, 'msg', str(err))
                 )
-                writer.close()
-                await writer.wait_closed()
                 raise err
             try:
                 response = await self.__get_response(reader)
@@ -226,13 +232,42 @@ Defaults to `None`.
 
             if response and response.get('response') != 'success':
                 raise ProcessingError(response) from None
-
-            responses[active_node] = response
-
+        finally:
             writer.close()
             await writer.wait_closed()
 
-        return responses
+        return active_node, response
+
+    async def __chunk_send(self, items: list) -> dict:
+        packet = ZabbixProtocol.create_packet(
+            self.__create_request(items),
+            log,
+            self.compression,
+            self.compression_level
+        )
+
+        # Send the packet to all clusters concurrently and wait for all of them
+        # to finish before raising the first error, so that no sending continues
+        # in the background after the error is reported.
+        results = await asyncio.gather(
+            *(self.__cluster_send(cluster, packet) for cluster in self.clusters),
+            return_exceptions=True
+        )
+
+        errors = []
+        for cluster, result in zip(self.clusters, results):
+            if isinstance(result, BaseException):
+                log.error(
+                    'An error occurred while trying to send to cluster %s: %s',
+                    cluster,
+                    getattr(result, 'msg', str(result))
+                )
+                errors.append(result)
+
+        if errors:
+            raise errors[0]
+
+        return dict(results)
 
     async def send(self, items: list) -> TrapperResponse:
         """Sends packets and receives an answer from Zabbix.
@@ -326,7 +326,7 @@ class ZabbixAPI():
 
         req = ul.Request(
             self.url,
-            data=json.dumps(request_json).encode("utf-8"),
+            data=ModuleUtils.json_encode(request_json),
             headers=headers,
             method='POST'
         )
@@ -342,7 +342,7 @@ class ZabbixAPI():
 
         try:
             resp = ul.urlopen(req, context=ctx)
-            resp_json = json.loads(resp.read().decode('utf-8'))
+            resp_json = json.loads(resp.read())
         except URLError as err:
             raise ProcessingError(f"Unable to connect to {self.url}:", err) from None
         except ValueError as err:
@@ -353,7 +353,8 @@ class ZabbixAPI():
                 "Received response body: %s",
                 resp_json
             )
-        else:
+        elif log.isEnabledFor(logging.DEBUG):
+            # Clipping of exported files is done only if it's going to be logged
             debug_json = resp_json.copy()
             if debug_json.get('result'):
                 debug_json['result'] = shorten(debug_json['result'], 200, placeholder='...')
@@ -29,10 +29,22 @@ import struct
 import asyncio
 
 from textwrap import shorten
-from logging import Logger
+from logging import Logger, DEBUG
 from socket import socket
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit
 
-from typing import Match, Union
+from typing import Match, Pattern, Union
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+
+@lru_cache(maxsize=32)
+def _compile_regex(regex: str) -> Pattern:
+    return re.compile(regex)
 
 
 class ModuleUtils():
@@ -61,6 +73,7 @@ class ModuleUtils():
     }
 
     @classmethod
+    @lru_cache(maxsize=128)
     def check_url(cls, url: str) -> str:
         """Check url completeness
 
@@ -71,12 +84,30 @@ class ModuleUtils():
             str: Checked URL of Zabbix API
         """
 
-        if not url.endswith(cls.JSONRPC_FILE):
-            url += cls.JSONRPC_FILE if url[-1] == '/' else '/' + cls.JSONRPC_FILE
-        if not url.startswith('http'):
+        if not url.startswith(('http://', 'https://')):
             url = 'http://' + url
 
-        return url
+        parts = urlsplit(url)
+        path = parts.path
+        if not path.endswith(cls.JSONRPC_FILE):
+            path = path.rstrip('/') + '/' + cls.JSONRPC_FILE
+
+        return urlunsplit(parts._replace(path=path))
+
+    @classmethod
+    def json_encode(cls, data: Union[list, dict]) -> bytes:
+        """Encode data to JSON in UTF-8 bytes using orjson if it's installed.
+
+        Args:
+            data (list|dict): JSON-serializable data.
+
+        Returns:
+            bytes: UTF-8 encoded JSON.
+        """
+
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data, ensure_ascii=False).encode("utf-8")
 
     @classmethod
     def mask_secret(cls, string: str, show_len: int = 4) -> str:
@@ -118,16 +149,28 @@ Defaults to 4.
             raise TypeError(f"Unsupported data type '{type(input_data).__name__}', \
 only 'dict' is expected")
 
-        def gen_repl(match: Match):
-            return cls.mask_secret(match.group(0))
+        def gen_repl(match: Match, mask=cls.mask_secret):
+            return mask(match.group(0))
 
         def hide_str(k, v):
-            return re.sub(private_fields[k], gen_repl, v)
+            return _compile_regex(private_fields[k]).sub(gen_repl, v)
 
         def hide_dict(v):
             return cls.hide_private(v, private_fields)
 
+        def list_field(k):
+            # The 'result' regex is used to hide only token or
+            # sessionid format for unknown values
+            field = k.rstrip('s')
+            if field in private_fields:
+                return field
+            return 'result' if 'result' in private_fields else ''
+
         def hide_list(k, v):
+            # The field used to hide string items is chosen once per list,
+            # on the first string item.
+            field = None
+
             result = []
             for item in v:
                 if isinstance(item, dict):
@@ -137,13 +180,10 @@ only 'dict' is expected")
                     result.append(hide_list(k, item))
                     continue
                 if isinstance(item, str):
-                    if k.rstrip('s') in private_fields:
-                        result.append(hide_str(k.rstrip('s'), item))
-                        continue
-                    # The 'result' regex is used to hide only token or
-                    # sessionid format for unknown values
-                    if 'result' in private_fields:
-                        result.append(hide_str('result', item))
+                    if field is None:
+                        field = list_field(k)
+                    if field:
+                        result.append(hide_str(field, item))
                         continue
                 result.append(item)
             return result
@@ -168,33 +208,54 @@ class ZabbixProtocol():
 
     HEADER_SIZE = 13
 
+    # Precompiled header layout: protocol, flags, datalen, reserved
+    HEADER_STRUCT = struct.Struct('<4sBII')
+
+    # Errors of unsupported packet flags combinations, indexed by the lower three bits.
+    # 0x01 - Zabbix communications protocol
+    # 0x02 - Using packet compression mode
+    # 0x04 - Using large packet mode
+    FLAGS_ERRORS = tuple(
+        'Unexcepted flags were received. Check debug log for more information.'
+        if not flags & 0x01 else
+        'A large packet flag was received. Current module doesn\'t support large packets.'
+        if flags & 0x04 else None
+        for flags in range(8)
+    )
+
     @classmethod
-    def __prepare_request(cls, data: Union[bytes, str, list, dict]) -> bytes:
-        if isinstance(data, bytes):
+    def __prepare_request(cls, data: Union[bytes, bytearray, str, list, dict]) -> bytes:
+        if isinstance(data, (bytes, bytearray)):
             return data
         if isinstance(data, str):
             return data.encode("utf-8")
         if isinstance(data, list) or isinstance(data, dict):
-            return json.dumps(data, ensure_ascii=False).encode("utf-8")
-        raise TypeError("Unsupported data type, only 'bytes', 'str', 'list' or 'dict' is expected")
+            return ModuleUtils.json_encode(data)
+        raise TypeError(
+            "Unsupported data type, only 'bytes', 'bytearray', 'str', 'list' or 'dict' is expected"
+        )
 
     @classmethod
-    def create_packet(cls, payload: Union[bytes, str, list, dict],
-                      log: Logger, compression: bool = False) -> bytes:
+    def create_packet(cls, payload: Union[bytes, bytearray, str, list, dict],
+                      log: Logger, compression: bool = False,
+                      compression_level: int = zlib.Z_DEFAULT_COMPRESSION) -> bytearray:
         """Create a packet for sending via the Zabbix protocol.
 
         Args:
-            payload (bytes|str|list|dict): Payload of the future packet
+            payload (bytes|bytearray|str|list|dict): Payload of the future packet
             log (Logger): Logger object
             compression (bool, optional): Compression use flag. Defaults to `False`.
+            compression_level (int, optional): Zlib compression level from `0` to `9` \
+or `-1` for the zlib default level. Defaults to `zlib.Z_DEFAULT_COMPRESSION` (`-1`).
 
         Returns:
-            bytes: Generated Zabbix protocol packet
+            bytearray: Generated Zabbix protocol packet
         """
 
         request = cls.__prepare_request(payload)
 
-        log.debug('Request data: %s', shorten(request.decode("utf-8"), 200, placeholder='...'))
+        if log.isEnabledFor(DEBUG):
+            log.debug('Request data: %s', shorten(request.decode("utf-8"), 200, placeholder='...'))
 
         # 0x01 - Zabbix communications protocol
         flags = 0x01
@@ -205,18 +266,22 @@ class ZabbixProtocol():
             # 0x02 - Using packet compression mode
             flags |= 0x02
             reserved = datalen
-            request = zlib.compress(request)
+            request = zlib.compress(request, compression_level)
             datalen = len(request)
 
-        header = struct.pack('<4sBII', cls.ZABBIX_PROTOCOL, flags, datalen, reserved)
-        packet = header + request
+        # Write the header and the payload into one pre-sized buffer
+        # to avoid an extra copy of the payload on concatenation.
+        packet = bytearray(cls.HEADER_SIZE + datalen)
+        cls.HEADER_STRUCT.pack_into(packet, 0, cls.ZABBIX_PROTOCOL, flags, datalen, reserved)
+        packet[cls.HEADER_SIZE:] = request
 
-        log.debug('Content of the packet: %s', shorten(str(packet), 200, placeholder='...'))
+        if log.isEnabledFor(DEBUG):
+            log.debug('Content of the packet: %s', shorten(str(packet), 200, placeholder='...'))
 
         return packet
 
     @classmethod
-    def receive_packet(cls, conn: socket, size: int, log: Logger) -> bytes:
+    def receive_packet(cls, conn: socket, size: int, log: Logger) -> bytearray:
         """Receive a Zabbix protocol packet.
 
         Args:
@@ -225,33 +290,86 @@ class ZabbixProtocol():
             log (Logger): Logger object
 
         Returns:
-            bytes: Received packet content
+            bytearray: Received packet content
         """
-        buf = b''
-
-        while len(buf) < size:
-            chunk = conn.recv(size - len(buf))
-            if not chunk:
-                log.debug("Socket connection was closed before receiving expected amount of data.")
-                break
-            buf += chunk
+        buf = bytearray(size)
+        received = 0
+
+        # Receive chunks directly into the preallocated buffer
+        # instead of growing it by concatenation.
+        with memoryview(buf) as view:
+            while received < size:
+                chunk_size = conn.recv_into(view[received:], size - received)
+                if not chunk_size:
+                    log.debug(
+                        "Socket connection was closed before receiving expected amount of data."
+                    )
+                    break
+                received += chunk_size
+
+        if received < size:
+            del buf[received:]
 
         return buf
 
     @classmethod
-    def parse_sync_packet(cls, conn: socket, log: Logger, exception) -> str:
+    def receive_compressed_packet(cls, conn: socket, size: int, log: Logger,
+                                  chunk_size: int = 16384) -> bytes:
+        """Receive a compressed Zabbix protocol packet and decompress it on the fly.
+
+        Args:
+            conn (socket): Opened socket connection
+            size (int): Expected compressed packet size
+            log (Logger): Logger object
+            chunk_size (int, optional): Size of the receiving buffer. Defaults to `16384`.
+
+        Raises:
+            zlib.error: Raises if the compressed data is corrupted or truncated.
+
+        Returns:
+            bytes: Decompressed packet content
+        """
+        decompressor = zlib.decompressobj()
+        result = []
+        remaining = size
+
+        # Decompress every received chunk right away instead of
+        # accumulating the whole compressed body first.
+        with memoryview(bytearray(min(chunk_size, size))) as view:
+            while remaining:
+                received = conn.recv_into(view, min(len(view), remaining))
+                if not received:
+                    log.debug(
+                        "Socket connection was closed before receiving expected amount of data."
+                    )
+                    break
+                result.append(decompressor.decompress(view[:received]))
+                remaining -= received
+
+        result.append(decompressor.flush())
+
+        if not decompressor.eof:
+            raise zlib.error('Error -5 while decompressing data: incomplete or truncated stream')
+
+        return b''.join(result)
+
+    @classmethod
+    def parse_sync_packet(cls, conn: socket, log: Logger, exception,
+                          decode: bool = True) -> Union[str, bytes, bytearray]:
         """Parse a received synchronously Zabbix protocol packet.
 
         Args:
             conn (socket): Opened socket connection
             log (Logger): Logger object
             exception: Exception type
+            decode (bool, optional): Decode the body from UTF-8. Defaults to `True`.
 
         Raises:
             exception: Depends on input exception type
 
         Returns:
-            str: Body of the received packet
+            str|bytes|bytearray: Body of the received packet, raw bytes-like object \
+if `decode` is `False`
         """
 
         response_header = cls.receive_packet(conn, cls.HEADER_SIZE, log)
@@ -262,42 +380,38 @@ class ZabbixProtocol():
             log.debug('Unexpected response was received from Zabbix.')
             raise exception('Unexpected response was received from Zabbix.')
 
-        flags, datalen, reserved = struct.unpack('<BII', response_header[4:])
+        _, flags, datalen, reserved = cls.HEADER_STRUCT.unpack_from(response_header)
 
-        # 0x01 - Zabbix communications protocol
-        if not flags & 0x01:
-            raise exception(
-                'Unexcepted flags were received. '
-                'Check debug log for more information.'
-            )
-        # 0x04 - Using large packet mode
-        if flags & 0x04:
-            raise exception(
-                'A large packet flag was received. '
-                'Current module doesn\'t support large packets.'
-            )
+        flags_error = cls.FLAGS_ERRORS[flags & 0x07]
+        if flags_error is not None:
+            raise exception(flags_error)
         # 0x02 - Using packet compression mode
         if flags & 0x02:
-            response_body = zlib.decompress(cls.receive_packet(conn, datalen, log))
+            response_body = cls.receive_compressed_packet(conn, datalen, log)
         else:
             response_body = cls.receive_packet(conn, datalen, log)
 
+        if not decode:
+            return response_body
+
         return response_body.decode("utf-8")
 
     @classmethod
-    async def parse_async_packet(cls, reader: asyncio.StreamReader, log: Logger, exception) -> str:
+    async def parse_async_packet(cls, reader: asyncio.StreamReader, log: Logger, exception,
+                                 decode: bool = True) -> Union[str, bytes]:
         """Parse a received asynchronously Zabbix protocol packet.
 
         Args:
             reader (StreamReader): Created asyncio.StreamReader
             log (Logger): Logger object
             exception: Exception type
+            decode (bool, optional): Decode the body from UTF-8. Defaults to `True`.
 
         Raises:
             exception: Depends on input exception type
 
         Returns:
-            str: Body of the received packet
+            str|bytes: Body of the received packet, raw bytes if `decode` is `False`
         """
 
         response_header = await reader.readexactly(cls.HEADER_SIZE)
@@ -308,24 +422,18 @@ class ZabbixProtocol():
             log.debug('Unexpected response was received from Zabbix.')
             raise exception('Unexpected response was received from Zabbix.')
 
-        flags, datalen, reserved = struct.unpack('<BII', response_header[4:])
+        _, flags, datalen, reserved = cls.HEADER_STRUCT.unpack_from(response_header)
 
-        # 0x01 - Zabbix communications protocol
-        if not flags & 0x01:
-            raise exception(
-                'Unexcepted flags were received. '
-                'Check debug log for more information.'
-            )
-        # 0x04 - Using large packet mode
-        if flags & 0x04:
-            raise exception(
-                'A large packet flag was received. '
-                'Current module doesn\'t support large packets.'
-            )
+        flags_error = cls.FLAGS_ERRORS[flags & 0x07]
+        if flags_error is not None:
+            raise exception(flags_error)
         # 0x02 - Using packet compression mode
         if flags & 0x02:
             response_body = zlib.decompress(await reader.readexactly(datalen))
         else:
             response_body = await reader.readexactly(datalen)
 
+        if not decode:
+            return response_body
+
         return response_body.decode("utf-8")
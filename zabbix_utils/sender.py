@@ -23,6 +23,7 @@
 # OTHER DEALINGS IN THE SOFTWARE.
 
 import json
+import zlib
 import socket
 import logging
 import configparser
@@ -54,6 +55,9 @@ class Sender():
         compression (bool, optional): Specifying compression use. Defaults to `False`.
         config_path (str, optional): Path to Zabbix agent configuration file. Defaults to \
 `/etc/zabbix/zabbix_agentd.conf`.
+        compression_level (int, optional): Zlib compression level from `0` to `9` or `-1` \
+for the zlib default level. Used only if compression is enabled. \
+Defaults to `zlib.Z_DEFAULT_COMPRESSION` (`-1`).
     """
 
     def __init__(self, server: Optional[str] = None, port: int = 10051,
@@ -61,7 +65,8 @@ class Sender():
                  use_ipv6: bool = False, source_ip: Optional[str] = None,
                  chunk_size: int = 250, clusters: Union[tuple, list] = None,
                  socket_wrapper: Optional[Callable] = None, compression: bool = False,
-                 config_path: Optional[str] = '/etc/zabbix/zabbix_agentd.conf'):
+                 config_path: Optional[str] = '/etc/zabbix/zabbix_agentd.conf',
+                 compression_level: int = zlib.Z_DEFAULT_COMPRESSION):
         self.timeout = timeout
         self.use_ipv6 = use_ipv6
         self.tls = {}
@@ -70,6 +75,10 @@ class Sender():
         self.chunk_size = chunk_size
         self.compression = compression
 
+        if compression_level not in range(-1, 10):
+            raise ValueError('Value "compression_level" should be from -1 to 9.') from None
+        self.compression_level = compression_level
+
         if socket_wrapper is not None:
             if not isinstance(socket_wrapper, Callable):
                 raise TypeError('Value "socket_wrapper" should be a function.') from None
@@ -119,7 +128,7 @@ class Sender():
     def __get_response(self, conn: socket) -> Optional[str]:
         try:
             result = json.loads(
-                ZabbixProtocol.parse_sync_packet(conn, log, ProcessingError)
+                ZabbixProtocol.parse_sync_packet(conn, log, ProcessingError, decode=False)
             )
         except json.decoder.JSONDecodeError as err:
             log.debug('Unexpected response was received from Zabbix.')
@@ -138,7 +147,12 @@ class Sender():
     def __chunk_send(self, items: list) -> dict:
         responses = {}
 
-        packet = ZabbixProtocol.create_packet(self.__create_request(items), log, self.compression)
+        packet = ZabbixProtocol.create_packet(
+            self.__create_request(items),
+            log,
+            self.compression,
+            self.compression_level
+        )
 
         for cluster in self.clusters:
             active_node = None